@@ -68,13 +68,20 @@ def ui_main_content(string_data):
     )
 
     k = st.number_input("Enter k-mer length", min_value=1, value=2) if "kmer_frequencies" in feature_types else None
+    fixed_schema = st.checkbox(
+        "Fixed column schema (every residue and k-mer, absent ones as 0)", value=True,
+        help="Wide k-mer schemas fall back to the observed k-mers only.",
+    )
+    dedup = st.checkbox("Remove near-duplicate sequences (MinHash/LSH)")
 
     if st.button("Extract Features"):
         if not feature_types:
             st.warning("Please select at least one feature type.")
         else:
             with st.spinner("Extracting features..."):
-                st.session_state.df = extract_features(string_data, feature_types, k)
+                st.session_state.df = extract_features(
+                    string_data, feature_types, k, fixed_schema=fixed_schema, dedup=dedup
+                )
             st.success("Features extracted successfully!")
 
     if st.session_state.df is not None:
@@ -110,13 +117,19 @@ def render_ml_section(df, numerical_cols):
         "Select missing value imputation strategy",
         ["Fill with 0", "Fill with Mean", "Fill with Median", "Drop rows"],
     )
+    split_strategy = st.selectbox(
+        "Select train/test split strategy",
+        ["Random", "Homology-aware"],
+        help="Homology-aware keeps clusters of near-duplicate sequences on one side of the split.",
+    )
 
     st.info("Note: A fixed random state (42) is used for reproducibility.")
 
     if st.button("Train Model"):
         with st.spinner("Training model..."):
             model, X_train, X_test, y_train, y_test, accuracy, cm = train_model(
-                df, st.session_state.labels_df, numerical_cols, model_type, imputation_strategy
+                df, st.session_state.labels_df, numerical_cols, model_type, imputation_strategy,
+                split_strategy,
             )
             if model:
                 st.session_state.update({
@@ -0,0 +1,128 @@
+import os
+import numpy as np
+
+
+class SequenceBatch:
+    """
+    A packed batch of sequences stored as one ragged array.
+
+    All residues are concatenated into a single uint8 buffer; sequence i spans
+    residues[offsets[i]:offsets[i + 1]]. The arrays can be saved to and memory-mapped
+    from disk, so worker processes can share a batch without copying it.
+
+    Attributes:
+        residues (numpy.ndarray): The concatenated residues as ASCII codes (uint8).
+        offsets (numpy.ndarray): The start of each sequence plus the total length (int64).
+        ids (numpy.ndarray): The sequence IDs.
+    """
+
+    def __init__(self, residues, offsets, ids):
+        if len(offsets) != len(ids) + 1:
+            raise ValueError("offsets must have exactly one more entry than ids.")
+        self.residues = residues
+        self.offsets = offsets
+        self.ids = ids
+
+    @classmethod
+    def from_sequences(cls, ids, sequences):
+        """
+        Packs sequence strings into a batch.
+
+        Args:
+            ids (list): The sequence IDs.
+            sequences (list): The sequences as strings.
+
+        Returns:
+            SequenceBatch: The packed batch.
+        """
+        encoded = [sequence.encode("ascii", "replace") for sequence in sequences]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(seq) for seq in encoded], out=offsets[1:])
+        residues = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        return cls(residues, offsets, np.array(ids, dtype=str))
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Packs Biopython SeqRecord objects into a batch.
+
+        Args:
+            records (list): A list of SeqRecord objects.
+
+        Returns:
+            SequenceBatch: The packed batch.
+        """
+        return cls.from_sequences([r.id for r in records], [str(r.seq) for r in records])
+
+    @classmethod
+    def load(cls, directory, mmap_mode="r"):
+        """
+        Loads a batch written by save, memory-mapping the arrays by default.
+
+        Args:
+            directory (str): The directory holding the batch arrays.
+            mmap_mode (str, optional): Passed to numpy.load; None reads into memory.
+
+        Returns:
+            SequenceBatch: The loaded batch.
+        """
+        return cls(
+            np.load(os.path.join(directory, "residues.npy"), mmap_mode=mmap_mode),
+            np.load(os.path.join(directory, "offsets.npy"), mmap_mode=mmap_mode),
+            np.load(os.path.join(directory, "ids.npy"), mmap_mode=mmap_mode),
+        )
+
+    def save(self, directory):
+        """
+        Saves the batch arrays as .npy files in a directory.
+
+        Args:
+            directory (str): The directory to write to. Created if it does not exist.
+        """
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "residues.npy"), self.residues)
+        np.save(os.path.join(directory, "offsets.npy"), self.offsets)
+        np.save(os.path.join(directory, "ids.npy"), self.ids)
+
+    @property
+    def lengths(self):
+        """numpy.ndarray: The length of each sequence."""
+        return np.diff(self.offsets)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, i):
+        """Returns sequence i as a string."""
+        return self.residues[self.offsets[i] : self.offsets[i + 1]].tobytes().decode("ascii")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def take(self, indices):
+        """
+        Returns a new batch holding only the selected sequences.
+
+        Contiguous ranges share the residue buffer; other selections copy it.
+
+        Args:
+            indices (array-like): Positions of the sequences to keep, in order.
+
+        Returns:
+            SequenceBatch: The selected sequences.
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        if len(indices) and np.array_equal(indices, np.arange(indices[0], indices[0] + len(indices))):
+            # A contiguous range is a view of the same buffers.
+            start, stop = indices[0], indices[0] + len(indices)
+            low, high = self.offsets[start], self.offsets[stop]
+            return SequenceBatch(
+                self.residues[low:high], self.offsets[start : stop + 1] - low, self.ids[start:stop]
+            )
+        lengths = self.lengths[indices]
+        offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        starts = self.offsets[indices]
+        positions = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return SequenceBatch(self.residues[positions], offsets, self.ids[indices])
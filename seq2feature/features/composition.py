@@ -1,4 +1,10 @@
 from collections import Counter
+from .kmers import count_kmers_batch, kmer_columns, kmer_count_to_frequency
+
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+EXTENDED_AMINO_ACIDS = AMINO_ACIDS + "BJZXO"
+AMINO_ACID_COLUMNS = kmer_columns(EXTENDED_AMINO_ACIDS, 1)
+DIPEPTIDE_COLUMNS = kmer_columns(AMINO_ACIDS, 2)
 
 
 def get_amino_acid_composition(sequence):
@@ -33,3 +39,33 @@ def get_dipeptide_composition(sequence):
     count = Counter(sequence[i : i + 2] for i in range(total))
     composition = {dp: c / total for dp, c in count.items()}
     return composition
+
+
+def get_amino_acid_composition_matrix(batch, out=None):
+    """
+    Calculates the amino acid composition of every sequence in a batch.
+
+    Args:
+        batch (SequenceBatch): The packed protein sequences.
+        out (numpy.ndarray, optional): A (len(batch), 25) array to write into.
+
+    Returns:
+        numpy.ndarray: A frequency matrix aligned with AMINO_ACID_COLUMNS.
+    """
+    counts = count_kmers_batch(batch, 1, EXTENDED_AMINO_ACIDS)
+    return kmer_count_to_frequency(counts, batch.lengths, out=out)
+
+
+def get_dipeptide_composition_matrix(batch, out=None):
+    """
+    Calculates the dipeptide composition of every sequence in a batch.
+
+    Args:
+        batch (SequenceBatch): The packed protein sequences.
+        out (numpy.ndarray, optional): A (len(batch), 400) array to write into.
+
+    Returns:
+        numpy.ndarray: A frequency matrix aligned with DIPEPTIDE_COLUMNS.
+    """
+    counts = count_kmers_batch(batch, 2, AMINO_ACIDS)
+    return kmer_count_to_frequency(counts, batch.lengths - 1, out=out)
@@ -1,4 +1,12 @@
 from collections import Counter
+from itertools import product
+import numpy as np
+
+KMER_ALPHABETS = {
+    "DNA": "ACGT",
+    "RNA": "ACGU",
+    "Protein": "ACDEFGHIKLMNPQRSTVWY",
+}
 
 
 def get_kmer_frequencies(sequence, k):
@@ -18,3 +26,102 @@ def get_kmer_frequencies(sequence, k):
     count = Counter(sequence[i : i + k] for i in range(total))
     frequencies = {kmer: c / total for kmer, c in count.items()}
     return frequencies
+
+
+def kmer_columns(alphabet, k):
+    """
+    Lists every k-mer over an alphabet in the order used by count_kmers_batch.
+
+    Args:
+        alphabet (str): The residues making up the k-mers.
+        k (int): The length of the k-mer.
+
+    Returns:
+        list: All len(alphabet) ** k k-mers.
+    """
+    return ["".join(kmer) for kmer in product(alphabet, repeat=k)]
+
+
+def encode_residues(residues, alphabet):
+    """
+    Maps ASCII residue codes to their position in an alphabet, ignoring case.
+
+    Args:
+        residues (numpy.ndarray): The residues as uint8 ASCII codes.
+        alphabet (str): The residues to encode.
+
+    Returns:
+        numpy.ndarray: The alphabet position of each residue, -1 if it is not in the alphabet.
+    """
+    lookup = np.full(256, -1, dtype=np.int64)
+    lookup[np.frombuffer(alphabet.lower().encode(), dtype=np.uint8)] = np.arange(len(alphabet))
+    lookup[np.frombuffer(alphabet.encode(), dtype=np.uint8)] = np.arange(len(alphabet))
+    return lookup[residues]
+
+
+def count_kmers_batch(batch, k, alphabet):
+    """
+    Counts the k-mers of every sequence in a batch in one pass over its residues.
+
+    Lowercase residues count as their uppercase form; k-mers containing residues
+    outside the alphabet or spanning two sequences are not counted.
+
+    Args:
+        batch (SequenceBatch): The packed sequences.
+        k (int): The length of the k-mer.
+        alphabet (str): The residues making up the k-mers.
+
+    Returns:
+        numpy.ndarray: A (len(batch), len(alphabet) ** k) count matrix aligned with
+        kmer_columns(alphabet, k).
+    """
+    base = len(alphabet)
+    n_kmers = base**k
+    codes = encode_residues(batch.residues, alphabet)
+    if len(codes) < k:
+        return np.zeros((len(batch), n_kmers), dtype=np.int64)
+    windows = np.lib.stride_tricks.sliding_window_view(codes, k)
+    starts = np.arange(len(windows))
+    owner = np.searchsorted(batch.offsets, starts, side="right") - 1
+    valid = (starts + k <= batch.offsets[owner + 1]) & (windows >= 0).all(axis=1)
+    index = windows[valid] @ (base ** np.arange(k - 1, -1, -1))
+    counts = np.bincount(owner[valid] * n_kmers + index, minlength=len(batch) * n_kmers)
+    return counts.reshape(len(batch), n_kmers)
+
+
+def kmer_count_to_frequency(counts, totals, out=None):
+    """
+    Divides each row of a count matrix by its total, leaving rows with no k-mers at 0.
+
+    Args:
+        counts (numpy.ndarray): The k-mer count matrix.
+        totals (array-like): The number of k-mer windows of each row.
+        out (numpy.ndarray, optional): Array to write into; the division is done in its
+            dtype. A new float64 array is allocated if omitted.
+
+    Returns:
+        numpy.ndarray: The frequency matrix.
+    """
+    totals = np.asarray(totals)[:, None]
+    if out is None:
+        out = np.empty(counts.shape)
+    out[:] = 0
+    np.divide(counts, totals, out=out, where=totals > 0, dtype=out.dtype)
+    return out
+
+
+def get_kmer_frequency_matrix(batch, k, seq_type, out=None):
+    """
+    Calculates k-mer frequencies for every sequence in a batch.
+
+    Args:
+        batch (SequenceBatch): The packed sequences.
+        k (int): The length of the k-mer.
+        seq_type (str): The sequence type, one of KMER_ALPHABETS.
+        out (numpy.ndarray, optional): A (len(batch), n_kmers) array to write into.
+
+    Returns:
+        numpy.ndarray: A frequency matrix aligned with kmer_columns(KMER_ALPHABETS[seq_type], k).
+    """
+    counts = count_kmers_batch(batch, k, KMER_ALPHABETS[seq_type])
+    return kmer_count_to_frequency(counts, batch.lengths - k + 1, out=out)
@@ -1,4 +1,13 @@
 from Bio.SeqUtils.ProtParam import ProteinAnalysis
+import numpy as np
+
+PHYSICOCHEMICAL_COLUMNS = [
+    "molecular_weight",
+    "aromaticity",
+    "instability_index",
+    "isoelectric_point",
+    "gravy",
+]
 
 
 def get_physicochemical_features(sequence):
@@ -24,3 +33,35 @@ def get_physicochemical_features(sequence):
     except Exception as e:
         print(f"An error occurred: {e}")
         return {}
+
+
+def get_physicochemical_vector(sequence):
+    """
+    Calculates physicochemical features aligned with PHYSICOCHEMICAL_COLUMNS.
+
+    Args:
+        sequence (str): The protein sequence.
+
+    Returns:
+        numpy.ndarray: The feature values, NaN where the calculation failed.
+    """
+    features = get_physicochemical_features(sequence)
+    return np.array([features.get(col, np.nan) for col in PHYSICOCHEMICAL_COLUMNS])
+
+
+def get_physicochemical_matrix(batch, out=None):
+    """
+    Calculates physicochemical features for every sequence in a batch.
+
+    Args:
+        batch (SequenceBatch): The packed protein sequences.
+        out (numpy.ndarray, optional): A (len(batch), 5) array to write into.
+
+    Returns:
+        numpy.ndarray: A feature matrix aligned with PHYSICOCHEMICAL_COLUMNS.
+    """
+    if out is None:
+        out = np.empty((len(batch), len(PHYSICOCHEMICAL_COLUMNS)))
+    for i, sequence in enumerate(batch):
+        out[i] = get_physicochemical_vector(sequence)
+    return out
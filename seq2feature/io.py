@@ -1,5 +1,17 @@
-from Bio import SeqIO
+from Bio import SeqIO, bgzf
+from Bio.Seq import Seq
+from Bio.SeqRecord import SeqRecord
+import gzip
 import io
+import os
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
 
 
 def read_fasta(data):
@@ -18,3 +30,238 @@ def read_fasta(data):
     except Exception as e:
         print(f"An unexpected error occurred while parsing FASTA data. Details: {e}")
         return []
+
+
+def detect_compression(path):
+    """
+    Detects the compression format of a file from its magic bytes.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        str: One of 'bgzip', 'gzip', 'zstd', or None for uncompressed files.
+    """
+    with open(path, "rb") as handle:
+        header = handle.read(16)
+    if header.startswith(GZIP_MAGIC):
+        # BGZF blocks are gzip members carrying a 'BC' extra subfield.
+        if header[3:4] == b"\x04" and header[12:14] == b"BC":
+            return "bgzip"
+        return "gzip"
+    if header.startswith(ZSTD_MAGIC):
+        return "zstd"
+    return None
+
+
+def open_fasta(path):
+    """
+    Opens a plain, gzip, bgzip, or zstd compressed FASTA file for streaming reads.
+
+    Args:
+        path (str): Path to the FASTA file.
+
+    Returns:
+        file object: A text handle that decompresses on the fly.
+    """
+    compression = detect_compression(path)
+    if compression in ("gzip", "bgzip"):
+        return gzip.open(path, "rt")
+    if compression == "zstd":
+        if zstandard is None:
+            raise ImportError("Reading zstd compressed FASTA requires the 'zstandard' package.")
+        return zstandard.open(path, "rt")
+    return open(path, "r")
+
+
+def fasta_index_path(path):
+    """Returns the default location of the offset index for a FASTA file."""
+    return f"{path}.fai"
+
+
+def _open_seekable(path):
+    """Opens a FASTA file in binary mode with a tell/seek compatible with the index."""
+    compression = detect_compression(path)
+    if compression == "bgzip":
+        return bgzf.BgzfReader(path, "rb")
+    if compression is None:
+        return open(path, "rb")
+    raise ValueError(
+        f"Random access requires a plain or bgzip compressed FASTA file, got '{compression}'."
+    )
+
+
+def build_fasta_index(path, index_path=None):
+    """
+    Builds a .fai-style offset index for a plain or bgzip compressed FASTA file.
+
+    Each line holds the record name, sequence length, offset of the first residue,
+    residues per line, and bytes per line. For bgzip files the offset is a BGZF
+    virtual offset.
+
+    Args:
+        path (str): Path to the FASTA file.
+        index_path (str, optional): Where to write the index. Defaults to '<path>.fai'.
+
+    Returns:
+        dict: A dictionary mapping record names to (length, offset, linebases, linewidth).
+    """
+    index = {}
+    name = None
+    with _open_seekable(path) as handle:
+        while True:
+            line = handle.readline()
+            if not line:
+                break
+            if line.startswith(b">"):
+                fields = line[1:].split(None, 1)
+                name = fields[0].decode() if fields else ""
+                index[name] = [0, handle.tell(), 0, 0]
+            elif name is not None:
+                entry = index[name]
+                bases = len(line.rstrip(b"\r\n"))
+                if entry[2] == 0:
+                    entry[2], entry[3] = bases, len(line)
+                entry[0] += bases
+
+    index = {name: tuple(entry) for name, entry in index.items()}
+    with open(index_path or fasta_index_path(path), "w") as out:
+        for name, (length, offset, linebases, linewidth) in index.items():
+            out.write(f"{name}\t{length}\t{offset}\t{linebases}\t{linewidth}\n")
+    return index
+
+
+def load_fasta_index(index_path):
+    """
+    Loads a .fai-style offset index written by build_fasta_index.
+
+    Args:
+        index_path (str): Path to the index file.
+
+    Returns:
+        dict: A dictionary mapping record names to (length, offset, linebases, linewidth).
+    """
+    index = {}
+    with open(index_path, "r") as handle:
+        for line in handle:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) >= 5:
+                index[fields[0]] = tuple(int(v) for v in fields[1:5])
+    return index
+
+
+def _bgzf_bytes_before(path, handle):
+    """Returns a reader for the bytes preceding a BGZF virtual offset."""
+    blocks = []
+
+    def read_before(offset, size):
+        block, within = offset >> 16, offset & 0xFFFF
+        handle.seek(block << 16)
+        data = handle.read(within)
+        while len(data) < size and block > 0:
+            if not blocks:
+                with open(path, "rb") as raw:
+                    blocks.extend((start, length) for start, _, _, length in bgzf.BgzfBlocks(raw))
+            previous = max(i for i, (start, _) in enumerate(blocks) if start < block)
+            block, length = blocks[previous]
+            handle.seek(block << 16)
+            data = handle.read(length) + data
+        return data[-size:], block == 0 and len(data) <= size
+
+    return read_before
+
+
+def _plain_bytes_before(handle):
+    """Returns a reader for the bytes preceding a plain file offset."""
+
+    def read_before(offset, size):
+        start = max(0, offset - size)
+        handle.seek(start)
+        return handle.read(offset - start), start == 0
+
+    return read_before
+
+
+def _header_before(offset, read_before):
+    """Returns the header line that ends right before a sequence offset, or None."""
+    size = 256
+    while True:
+        data, at_start = read_before(offset, size)
+        if not data.endswith(b"\n"):
+            return None
+        body = data[:-1]
+        cut = body.rfind(b"\n")
+        if cut >= 0 or at_start:
+            header = body[cut + 1 :].rstrip(b"\r")
+            return header if header.startswith(b">") else None
+        size *= 4
+
+
+def _fetch_indexed_records(path, ids, index):
+    """
+    Seeks to each requested record and parses only its header and sequence lines.
+
+    Raises ValueError if the index no longer matches the file.
+    """
+    offsets = sorted((index[i][1], i) for i in set(ids) if i in index)
+    records = []
+    with _open_seekable(path) as handle:
+        if isinstance(handle, bgzf.BgzfReader):
+            read_before = _bgzf_bytes_before(path, handle)
+        else:
+            read_before = _plain_bytes_before(handle)
+        for offset, name in offsets:
+            header = _header_before(offset, read_before)
+            title = header[1:].decode().rstrip() if header else ""
+            handle.seek(offset)
+            chunks = []
+            while True:
+                line = handle.readline()
+                if not line or line.startswith(b">"):
+                    break
+                chunks.append(line.strip())
+            sequence = b"".join(chunks).decode()
+            if not title or title.split(None, 1)[0] != name or len(sequence) != index[name][0]:
+                raise ValueError(
+                    f"The offset index does not match {path}; rebuild it with build_fasta_index."
+                )
+            records.append(SeqRecord(Seq(sequence), id=name, name=name, description=title))
+    return records
+
+
+def read_fasta_file(path, ids=None, index_path=None):
+    """
+    Reads a plain or compressed FASTA file and returns a list of SeqRecord objects.
+
+    When ids are given and an offset index exists, only the requested records are
+    read from disk; otherwise the file is streamed and filtered on the fly. Both
+    paths return the same records, including the full header as description.
+
+    Args:
+        path (str): Path to the FASTA file.
+        ids (list, optional): Record IDs to return, in file order.
+        index_path (str, optional): Path to the offset index. Defaults to '<path>.fai'.
+
+    Returns:
+        list: A list of SeqRecord objects.
+
+    Raises:
+        ValueError: If the offset index is out of date with the file.
+    """
+    path = os.fspath(path)
+    if ids is None:
+        with open_fasta(path) as handle:
+            return list(SeqIO.parse(handle, "fasta"))
+
+    wanted = set(ids)
+    index_path = index_path or fasta_index_path(path)
+    if os.path.exists(index_path) and detect_compression(path) in (None, "bgzip"):
+        records = _fetch_indexed_records(path, wanted, load_fasta_index(index_path))
+    else:
+        with open_fasta(path) as handle:
+            records = [r for r in SeqIO.parse(handle, "fasta") if r.id in wanted]
+
+    missing = len(wanted) - len(records)
+    if missing > 0:
+        print(f"Warning: {missing} requested IDs were not found in {path}.")
+    return records
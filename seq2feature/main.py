@@ -1,11 +1,36 @@
-import pandas as pd
 import argparse
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
 import streamlit as st
-from .io import read_fasta
-from .utils import detect_sequence_type
-from .features.composition import get_amino_acid_composition, get_dipeptide_composition
-from .features.kmers import get_kmer_frequencies
-from .features.physicochem import get_physicochemical_features
+from Bio.Seq import Seq
+from Bio.SeqRecord import SeqRecord
+
+from .batch import SequenceBatch
+from .io import read_fasta, read_fasta_file, build_fasta_index, fasta_index_path
+from .similarity import deduplicate
+from .utils import detect_sequence_type, detect_sequence_types
+from .features.composition import (
+    AMINO_ACID_COLUMNS,
+    DIPEPTIDE_COLUMNS,
+    get_amino_acid_composition,
+    get_amino_acid_composition_matrix,
+    get_dipeptide_composition,
+    get_dipeptide_composition_matrix,
+)
+from .features.kmers import (
+    KMER_ALPHABETS,
+    get_kmer_frequencies,
+    get_kmer_frequency_matrix,
+    kmer_columns,
+)
+from .features.physicochem import (
+    PHYSICOCHEMICAL_COLUMNS,
+    get_physicochemical_features,
+    get_physicochemical_matrix,
+)
 
 FEATURE_REGISTRY = {
     "amino_acid_composition": (get_amino_acid_composition, ["Protein"]),
@@ -14,6 +39,103 @@ FEATURE_REGISTRY = {
     "physicochemical": (get_physicochemical_features, ["Protein"]),
 }
 
+# Column name prefixes keep families with overlapping keys (e.g. dipeptides and
+# 2-mers) in separate columns.
+FEATURE_PREFIXES = {
+    "amino_acid_composition": "aac_",
+    "dipeptide_composition": "dpc_",
+    "kmer_frequencies": "kmer_",
+    "physicochemical": "",
+}
+
+# Upper bounds on the matrix cells and residues handled per batch function call,
+# which cap the temporary arrays of the k-mer counters.
+FILL_CHUNK_CELLS = 1 << 18
+FILL_CHUNK_RESIDUES = 1 << 18
+
+# Widest fixed schema extract_features preallocates; wider k-mer schemas (e.g.
+# DNA with k > 8 or protein with k > 3) fall back to the observed-key path.
+MAX_FIXED_SCHEMA_COLUMNS = 1 << 16
+
+FEATURE_SCHEMAS = {
+    "amino_acid_composition": (AMINO_ACID_COLUMNS, get_amino_acid_composition_matrix),
+    "dipeptide_composition": (DIPEPTIDE_COLUMNS, get_dipeptide_composition_matrix),
+    "physicochemical": (PHYSICOCHEMICAL_COLUMNS, get_physicochemical_matrix),
+}
+
+def _feature_schema(feature, seq_type, k=None):
+    """Returns the fixed columns and batch function of a feature for a sequence type."""
+    if feature == "kmer_frequencies":
+        columns = kmer_columns(KMER_ALPHABETS[seq_type], k)
+        return columns, lambda batch, out=None: get_kmer_frequency_matrix(batch, k, seq_type, out=out)
+    return FEATURE_SCHEMAS[feature]
+
+def _fixed_schema_width(seq_types, feature_types, k=None):
+    """Returns an upper bound on the fixed schema columns, without building the names."""
+    width = 0
+    for feature in feature_types:
+        _, supported_types = FEATURE_REGISTRY.get(feature, (None, []))
+        for seq_type in dict.fromkeys(seq_types):
+            if seq_type not in supported_types:
+                continue
+            if feature == "kmer_frequencies":
+                width += len(KMER_ALPHABETS[seq_type]) ** k
+            else:
+                width += len(FEATURE_SCHEMAS[feature][0])
+    return width
+
+def _build_feature_plan(seq_types, feature_types, k=None):
+    """
+    Lays out the feature matrix columns for the sequence types present.
+
+    Returns the column names and a list of (sequence type, column positions,
+    batch function) steps that together fill the matrix.
+    """
+    columns, positions, plan = [], {}, []
+    for feature in feature_types:
+        _, supported_types = FEATURE_REGISTRY.get(feature, (None, []))
+        for seq_type in dict.fromkeys(seq_types):
+            if seq_type not in supported_types:
+                continue
+            names, matrix_func = _feature_schema(feature, seq_type, k)
+            names = [FEATURE_PREFIXES[feature] + name for name in names]
+            for name in names:
+                if name not in positions:
+                    positions[name] = len(columns)
+                    columns.append(name)
+            index = np.array([positions[name] for name in names], dtype=np.intp)
+            plan.append((seq_type, index, matrix_func))
+    return columns, plan
+
+def _is_contiguous(index):
+    """Checks whether sorted positions form one unbroken range."""
+    return len(index) > 0 and index[-1] - index[0] + 1 == len(index)
+
+def _fill_feature_block(matrix, rows, index, batch, matrix_func):
+    """
+    Fills matrix[rows, index] with a batch feature function, a chunk of rows at a time.
+
+    Contiguous blocks are written in place through a view of the matrix; others
+    go through a chunk-sized buffer of the matrix dtype.
+    """
+    columns_contiguous = _is_contiguous(index)
+    chunk_rows = max(1, FILL_CHUNK_CELLS // max(1, len(index)))
+    residues = np.cumsum(batch.lengths[rows])
+    start = 0
+    while start < len(rows):
+        done = residues[start - 1] if start else 0
+        stop = np.searchsorted(residues, done + FILL_CHUNK_RESIDUES, side="right")
+        stop = min(start + chunk_rows, max(start + 1, stop))
+        chunk = rows[start:stop]
+        start = stop
+        sub_batch = batch.take(chunk)
+        if columns_contiguous and _is_contiguous(chunk):
+            out = matrix[chunk[0] : chunk[-1] + 1, index[0] : index[-1] + 1]
+            matrix_func(sub_batch, out=out)
+        else:
+            out = np.empty((len(chunk), len(index)), dtype=matrix.dtype)
+            matrix[np.ix_(chunk, index)] = matrix_func(sub_batch, out=out)
+
 def _extract_single_sequence_features(sequence, seq_type, feature_types, k=None):
     """Extracts features for a single sequence based on its type."""
     features = {}
@@ -21,26 +143,99 @@ def _extract_single_sequence_features(sequence, seq_type, feature_types, k=None)
         func, supported_types = FEATURE_REGISTRY.get(feature, (None, []))
         if func and seq_type in supported_types:
             if feature == "kmer_frequencies" and k is not None:
-                features.update(func(sequence, k))
+                values = func(sequence, k)
             else:
-                features.update(func(sequence))
+                values = func(sequence)
+            prefix = FEATURE_PREFIXES[feature]
+            features.update({prefix + key: value for key, value in values.items()})
     return features
 
-@st.cache_data
-def extract_features(fasta_content, feature_types, k=None, sequence_type="auto"):
+@st.cache_data(hash_funcs={SequenceBatch: lambda b: (b.residues, b.offsets, b.ids)})
+def extract_features(
+    fasta_content, feature_types, k=None, sequence_type="auto", ids=None,
+    fixed_schema=True, dtype="float64", include_sequence=True, dedup=False,
+):
     """
     Extracts features from a FASTA string, with enhanced modularity and performance.
 
     Args:
-        fasta_content (str): The string containing the FASTA data.
+        fasta_content (str, os.PathLike or SequenceBatch): The string containing the
+            FASTA data, a path to a plain or compressed FASTA file, or packed sequences.
         feature_types (list): A list of feature types to extract.
         k (int, optional): The k-mer length for k-mer frequencies.
         sequence_type (str): The type of sequence, e.g., 'DNA', 'RNA', 'Protein', or 'auto'.
+        ids (list, optional): Only extract features for these record IDs. For indexed
+            files the requested records are read directly via the offset index.
+        fixed_schema (bool): Write features into a preallocated matrix with a fixed
+            column schema per feature family, so absent residues and k-mers are 0.
+            If False, or if the schema would exceed MAX_FIXED_SCHEMA_COLUMNS
+            columns, rows are assembled from the observed keys only.
+        dtype (str): Floating point dtype of the preallocated feature matrix.
+        include_sequence (bool): Whether to add a 'sequence' column with the residues.
+        dedup (bool): Keep only the first sequence of each near-duplicate cluster,
+            found with MinHash/LSH, before extracting features.
     
     Returns:
         pandas.DataFrame: A DataFrame with the extracted features.
     """
-    records = read_fasta(fasta_content)
+    batch, records = None, None
+    if isinstance(fasta_content, SequenceBatch):
+        batch = fasta_content
+        if ids is not None:
+            batch = batch.take(np.flatnonzero(np.isin(batch.ids, list(ids))))
+    elif isinstance(fasta_content, os.PathLike):
+        records = read_fasta_file(fasta_content, ids=ids)
+    else:
+        records = read_fasta(fasta_content)
+        if ids is not None:
+            wanted = set(ids)
+            records = [r for r in records if r.id in wanted]
+
+    if batch is None:
+        batch = SequenceBatch.from_records(records)
+    if dedup:
+        batch = deduplicate(batch)
+    if fixed_schema:
+        if sequence_type == "auto":
+            seq_types = np.array(detect_sequence_types(batch), dtype=object)
+        else:
+            seq_types = np.full(len(batch), sequence_type, dtype=object)
+        width = _fixed_schema_width(seq_types, feature_types, k)
+        if width > MAX_FIXED_SCHEMA_COLUMNS:
+            message = (
+                f"The fixed schema would have {width} columns (limit {MAX_FIXED_SCHEMA_COLUMNS}); "
+                "only the observed k-mers are kept as columns instead."
+            )
+            print(f"Warning: {message}")
+            st.warning(message)
+            fixed_schema = False
+    if not fixed_schema:
+        records = [SeqRecord(Seq(sequence), id=i) for i, sequence in zip(batch.ids, batch)]
+        return _extract_features_by_row(records, feature_types, k, sequence_type)
+
+    columns, plan = _build_feature_plan(seq_types, feature_types, k)
+    # Families that do not apply to a sequence type stay NaN.
+    matrix = np.full((len(batch), len(columns)), np.nan, dtype=dtype)
+
+    with st.spinner("Extracting features..."):
+        progress_bar = st.progress(0)
+        for step, (seq_type, index, matrix_func) in enumerate(plan):
+            rows = np.flatnonzero(seq_types == seq_type)
+            _fill_feature_block(matrix, rows, index, batch, matrix_func)
+            progress_bar.progress((step + 1) / len(plan))
+
+    # Wrap the matrix without copying it and put the metadata columns in front.
+    df = pd.DataFrame(matrix, columns=columns, copy=False)
+    meta = {"id": batch.ids}
+    if include_sequence:
+        meta["sequence"] = list(batch)
+    meta["type"] = seq_types
+    for position, (name, values) in enumerate(meta.items()):
+        df.insert(position, name, values)
+    return df
+
+def _extract_features_by_row(records, feature_types, k=None, sequence_type="auto"):
+    """Extracts features one dict per record, keeping only the observed keys."""
     all_features = []
 
     with st.spinner("Extracting features..."):
@@ -70,6 +265,21 @@ def main():
         "--sequence_type", type=str, default="auto", choices=["auto", "DNA", "RNA", "Protein"],
         help="Specify the sequence type or 'auto' for detection."
     )
+    parser.add_argument(
+        "--ids", nargs="+", help="Only extract features for these record IDs."
+    )
+    parser.add_argument(
+        "--dedup", action="store_true",
+        help="Drop near-duplicate sequences (MinHash/LSH) before extracting features."
+    )
+    parser.add_argument(
+        "--no_fixed_schema", action="store_true",
+        help="Only create columns for the residues and k-mers observed in the input."
+    )
+    parser.add_argument(
+        "--build_index", action="store_true",
+        help="Build a .fai offset index next to the input file if it does not exist yet."
+    )
 
     args = parser.parse_args()
 
@@ -77,13 +287,18 @@ def main():
         parser.error("--k is required when 'kmer_frequencies' is specified.")
 
     try:
-        with open(args.input, "r") as f:
-            fasta_content = f.read()
-        df = extract_features(fasta_content, args.feature_types, args.k, args.sequence_type)
+        if args.build_index and not os.path.exists(fasta_index_path(args.input)):
+            build_fasta_index(args.input)
+        df = extract_features(
+            Path(args.input), args.feature_types, args.k, args.sequence_type, ids=args.ids,
+            fixed_schema=not args.no_fixed_schema, dedup=args.dedup,
+        )
         df.to_csv(args.output, index=False)
         print(f"Features extracted and saved to {args.output}")
     except FileNotFoundError:
         print(f"Error: Input file not found at {args.input}")
+    except (ValueError, ImportError) as e:
+        print(f"Error: {e}")
 
 if __name__ == "__main__":
     main()
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
@@ -5,10 +6,45 @@ from sklearn.svm import SVC
 from sklearn.metrics import accuracy_score, confusion_matrix
 import shap
 import streamlit as st
+from .batch import SequenceBatch
+from .similarity import cluster_sequences
 
-def train_model(df, labels_df, numerical_cols, model_type, imputation_strategy):
+def group_train_test_split(groups, test_size=0.2, random_state=42):
+    """
+    Splits rows into train and test sets without splitting any group.
+
+    Groups are visited in random order and added to the test set unless they would
+    push it past test_size of the rows, so the fraction refers to rows rather than
+    groups and a dominant group cannot end up in the test set. If no group fits,
+    the smallest group forms the test set.
+
+    Args:
+        groups (array-like): A group label for every row.
+        test_size (float): The target fraction of rows in the test set.
+        random_state (int): Seed for shuffling the groups.
+
+    Returns:
+        tuple: The train and test row positions.
+    """
+    _, inverse, sizes = np.unique(groups, return_inverse=True, return_counts=True)
+    order = np.random.default_rng(random_state).permutation(len(sizes))
+    target = test_size * len(inverse)
+    chosen, filled = [], 0
+    for group in order:
+        if filled + sizes[group] <= target:
+            chosen.append(group)
+            filled += sizes[group]
+    if not chosen:
+        chosen = [np.argmin(sizes)]
+    in_test = np.isin(inverse, chosen)
+    return np.flatnonzero(~in_test), np.flatnonzero(in_test)
+
+def train_model(df, labels_df, numerical_cols, model_type, imputation_strategy, split_strategy="Random"):
     """
     Trains a machine learning model with improved data handling and user feedback.
+
+    With the "Homology-aware" split strategy, near-duplicate sequences are clustered
+    with MinHash/LSH and each cluster is kept entirely on one side of the split.
     """
     merged_df = pd.merge(df, labels_df, on="id")
     X = merged_df[numerical_cols]
@@ -32,7 +68,21 @@ def train_model(df, labels_df, numerical_cols, model_type, imputation_strategy):
         st.warning("Dataset too small for a meaningful train/test split.")
         return None, None, None, None, None, None, None
 
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    if split_strategy == "Homology-aware":
+        if "sequence" not in merged_df.columns:
+            st.warning("A homology-aware split requires the 'sequence' column.")
+            return None, None, None, None, None, None, None
+        rows = merged_df.loc[X.index]
+        batch = SequenceBatch.from_sequences(list(rows["id"]), list(rows["sequence"]))
+        groups = cluster_sequences(batch)
+        if len(np.unique(groups)) < 2:
+            st.warning("All sequences are near-duplicates of each other; a homology-aware split is not possible.")
+            return None, None, None, None, None, None, None
+        train_idx, test_idx = group_train_test_split(groups, test_size=0.2, random_state=42)
+        X_train, X_test = X.iloc[train_idx], X.iloc[test_idx]
+        y_train, y_test = y.iloc[train_idx], y.iloc[test_idx]
+    else:
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
     model_factory = {
         "RandomForest": RandomForestClassifier(random_state=42),
@@ -40,7 +90,7 @@ def train_model(df, labels_df, numerical_cols, model_type, imputation_strategy):
     }
     model = model_factory.get(model_type)
 
-    if model:
+    if model is not None:
         model.fit(X_train, y_train)
         y_pred = model.predict(X_test)
         accuracy = accuracy_score(y_test, y_pred)
@@ -0,0 +1,198 @@
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from .utils import detect_sequence_types
+
+EMPTY_HASH = np.iinfo(np.uint64).max
+UPPERCASE = np.frombuffer(bytes(range(256)).upper(), dtype=np.uint8)
+CHUNK_RESIDUES = 1 << 18
+PERMUTATION_BLOCK = 16
+# Signature pairs compared per step, and leaders tried per LSH bucket before the
+# remaining members are left to the other bands.
+PAIR_CHUNK = 1 << 12
+MAX_BUCKET_LEADERS = 8
+# Nucleotide alphabets are small, so short k-mers occur in almost every long
+# sequence; longer k-mers keep unrelated nucleotide k-mer sets apart.
+MINHASH_KMER_SIZES = {"DNA": 16, "RNA": 16, "Protein": 5}
+DEFAULT_MINHASH_KMER_SIZE = 5
+
+
+def _mix64(x):
+    """Scrambles 64-bit integers with the splitmix64 finalizer."""
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _kmer_hashes(residues, offsets, k):
+    """Hashes every k-mer that lies within one sequence, grouped by sequence."""
+    if len(residues) < k:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.uint64)
+    windows = np.lib.stride_tricks.sliding_window_view(residues, k)
+    starts = np.arange(len(windows))
+    owner = np.searchsorted(offsets, starts, side="right") - 1
+    valid = starts + k <= offsets[owner + 1]
+    windows = windows[valid].astype(np.uint64)
+    hashes = np.zeros(len(windows), dtype=np.uint64)
+    for j in range(k):
+        hashes = _mix64(hashes ^ windows[:, j])
+    return owner[valid], hashes
+
+
+def minhash_signatures(batch, k=5, num_perm=128, seed=42):
+    """
+    Computes MinHash signatures of the k-mer set of every sequence in a batch.
+
+    The fraction of equal signature entries between two sequences estimates the
+    Jaccard similarity of their k-mer sets. Sequences shorter than k get a
+    signature of EMPTY_HASH values.
+
+    Args:
+        batch (SequenceBatch): The packed sequences.
+        k (int): The k-mer length.
+        num_perm (int): The number of hash permutations (signature length).
+        seed (int): Seed for the hash permutations.
+
+    Returns:
+        numpy.ndarray: A (len(batch), num_perm) uint64 signature matrix.
+    """
+    # Each permutation is an xor followed by multiplication with an odd constant,
+    # both bijections on 64-bit integers, applied to the mixed k-mer hashes.
+    rng = np.random.default_rng(seed)
+    xors = rng.integers(0, EMPTY_HASH, size=(num_perm, 1), dtype=np.uint64, endpoint=True)
+    multipliers = rng.integers(0, EMPTY_HASH, size=(num_perm, 1), dtype=np.uint64, endpoint=True)
+    multipliers |= np.uint64(1)
+    signatures = np.full((len(batch), num_perm), EMPTY_HASH, dtype=np.uint64)
+    offsets = batch.offsets
+
+    # Hash a bounded number of residues at a time to keep memory flat.
+    start = 0
+    while start < len(batch):
+        stop = np.searchsorted(offsets, offsets[start] + CHUNK_RESIDUES, side="right") - 1
+        stop = min(max(stop, start + 1), len(batch))
+        low, high = offsets[start], offsets[stop]
+        residues = UPPERCASE[batch.residues[low:high]]
+        owner, hashes = _kmer_hashes(residues, offsets[start : stop + 1] - low, k)
+        if len(hashes):
+            present, first = np.unique(owner, return_index=True)
+            for block in range(0, num_perm, PERMUTATION_BLOCK):
+                block_slice = slice(block, block + PERMUTATION_BLOCK)
+                permuted = (hashes ^ xors[block_slice]) * multipliers[block_slice]
+                minima = np.minimum.reduceat(permuted, first, axis=1)
+                signatures[start + present, block_slice] = minima.T
+        start = stop
+    return signatures
+
+
+def _similar(signatures, sources, targets, threshold):
+    """Checks which signature pairs reach the estimated Jaccard similarity threshold."""
+    passed = np.empty(len(sources), dtype=bool)
+    for start in range(0, len(sources), PAIR_CHUNK):
+        pairs = slice(start, start + PAIR_CHUNK)
+        matches = signatures[sources[pairs]] == signatures[targets[pairs]]
+        passed[pairs] = matches.mean(axis=1) >= threshold
+    return passed
+
+
+def near_duplicate_clusters(signatures, bands=32, threshold=0.5):
+    """
+    Groups sequences into near-duplicate clusters with locality-sensitive hashing.
+
+    Signatures are split into bands; sequences sharing a band land in the same
+    bucket. Each member is compared with the first member of its bucket; members
+    that fail are compared with the first of the remaining members, and so on for
+    up to MAX_BUCKET_LEADERS leaders, so the work stays linear in the number of
+    sequences. Pairs whose estimated Jaccard similarity reaches the threshold are
+    linked, and clusters are the connected components of the links.
+
+    Args:
+        signatures (numpy.ndarray): MinHash signatures from minhash_signatures.
+        bands (int): The number of LSH bands. Must not exceed the signature length.
+        threshold (float): Minimum estimated Jaccard similarity to link two sequences.
+
+    Returns:
+        numpy.ndarray: A cluster label for every sequence.
+    """
+    n, num_perm = signatures.shape
+    rows = num_perm // bands
+    if rows == 0:
+        raise ValueError("The number of bands cannot exceed the signature length.")
+
+    candidates = np.flatnonzero((signatures != EMPTY_HASH).any(axis=1))
+    sources, targets = [np.empty(0, dtype=np.intp)], [np.empty(0, dtype=np.intp)]
+    for band in range(bands):
+        keys = signatures[candidates, band * rows : (band + 1) * rows]
+        _, buckets = np.unique(keys, axis=0, return_inverse=True)
+        members, buckets = candidates, buckets.ravel()
+        # Members that fail against their bucket's leader may still match each
+        # other, so they are regrouped under the first of them.
+        for _ in range(MAX_BUCKET_LEADERS):
+            _, first, inverse = np.unique(buckets, return_index=True, return_inverse=True)
+            leaders = members[first[inverse]]
+            linked = leaders != members
+            passed = np.zeros(len(members), dtype=bool)
+            passed[linked] = _similar(signatures, leaders[linked], members[linked], threshold)
+            sources.append(leaders[passed])
+            targets.append(members[passed])
+            remaining = linked & ~passed
+            if not remaining.any():
+                break
+            members, buckets = members[remaining], buckets[remaining]
+
+    sources, targets = np.concatenate(sources), np.concatenate(targets)
+    graph = coo_matrix((np.ones(len(sources)), (sources, targets)), shape=(n, n))
+    _, labels = connected_components(graph, directed=False)
+    return labels
+
+
+def _typed_minhash_signatures(batch, num_perm=128, seed=42):
+    """Computes MinHash signatures with the k-mer size suited to each sequence type."""
+    sizes = np.array(
+        [MINHASH_KMER_SIZES.get(t, DEFAULT_MINHASH_KMER_SIZE) for t in detect_sequence_types(batch)],
+        dtype=np.intp,
+    )
+    signatures = np.empty((len(batch), num_perm), dtype=np.uint64)
+    for k in np.unique(sizes):
+        rows = np.flatnonzero(sizes == k)
+        signatures[rows] = minhash_signatures(batch.take(rows), k=int(k), num_perm=num_perm, seed=seed)
+    return signatures
+
+
+def cluster_sequences(batch, k=None, num_perm=128, bands=32, threshold=0.5, seed=42):
+    """
+    Finds near-duplicate clusters in a batch of sequences.
+
+    Args:
+        batch (SequenceBatch): The packed sequences.
+        k (int, optional): The k-mer length. By default it follows the detected
+            sequence type (see MINHASH_KMER_SIZES).
+        num_perm (int): The MinHash signature length.
+        bands (int): The number of LSH bands.
+        threshold (float): Minimum estimated Jaccard similarity to link two sequences.
+        seed (int): Seed for the hash permutations.
+
+    Returns:
+        numpy.ndarray: A cluster label for every sequence.
+    """
+    if k is None:
+        signatures = _typed_minhash_signatures(batch, num_perm=num_perm, seed=seed)
+    else:
+        signatures = minhash_signatures(batch, k=k, num_perm=num_perm, seed=seed)
+    return near_duplicate_clusters(signatures, bands=bands, threshold=threshold)
+
+
+def deduplicate(batch, **kwargs):
+    """
+    Keeps the first sequence of every near-duplicate cluster.
+
+    Args:
+        batch (SequenceBatch): The packed sequences.
+        **kwargs: Passed to cluster_sequences.
+
+    Returns:
+        SequenceBatch: The representative sequences, in their original order.
+    """
+    labels = cluster_sequences(batch, **kwargs)
+    _, first = np.unique(labels, return_index=True)
+    return batch.take(np.sort(first))
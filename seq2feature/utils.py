@@ -1,4 +1,11 @@
 import re
+import numpy as np
+
+SEQUENCE_ALPHABETS = {
+    "DNA": "ACGTN",
+    "RNA": "ACGUN",
+    "Protein": "ACDEFGHIKLMNPQRSTVWYBJZXO",
+}
 
 
 def detect_sequence_type(sequence):
@@ -21,3 +28,26 @@ def detect_sequence_type(sequence):
         return "Protein"
     else:
         return "Unknown"
+
+
+def detect_sequence_types(batch):
+    """
+    Detects the type of every sequence in a batch, following detect_sequence_type.
+
+    Args:
+        batch (SequenceBatch): The packed sequences.
+
+    Returns:
+        list: The sequence type of each sequence.
+    """
+    upper = np.frombuffer(bytes(range(256)).upper(), dtype=np.uint8)[batch.residues]
+    lengths = batch.lengths
+    owner = np.repeat(np.arange(len(batch)), lengths)
+    types = np.full(len(batch), "Unknown", dtype=object)
+    # Assign from the least to the most specific type so DNA wins over RNA and Protein.
+    for seq_type in ("Protein", "RNA", "DNA"):
+        allowed = np.zeros(256, dtype=bool)
+        allowed[np.frombuffer(SEQUENCE_ALPHABETS[seq_type].encode(), dtype=np.uint8)] = True
+        invalid = np.bincount(owner[~allowed[upper]], minlength=len(batch))
+        types[(lengths > 0) & (invalid == 0)] = seq_type
+    return list(types)
@@ -0,0 +1,26 @@
+import numpy as np
+from seq2feature.batch import SequenceBatch
+
+
+def test_sequence_batch_packing():
+    """Tests packing, indexing, and selecting sequences in a batch."""
+    batch = SequenceBatch.from_sequences(["a", "b", "c"], ["ACGT", "", "GGA"])
+    assert len(batch) == 3
+    assert batch.residues.dtype == np.uint8
+    assert list(batch.offsets) == [0, 4, 4, 7]
+    assert list(batch.lengths) == [4, 0, 3]
+    assert list(batch) == ["ACGT", "", "GGA"]
+
+    subset = batch.take([2, 0])
+    assert list(subset.ids) == ["c", "a"]
+    assert list(subset) == ["GGA", "ACGT"]
+
+
+def test_sequence_batch_save_load(tmp_path):
+    """Tests that a saved batch is memory-mapped back unchanged."""
+    batch = SequenceBatch.from_sequences(["a", "b"], ["ARND", "WY"])
+    batch.save(tmp_path / "batch")
+    loaded = SequenceBatch.load(tmp_path / "batch")
+    assert isinstance(loaded.residues, np.memmap)
+    assert list(loaded.ids) == ["a", "b"]
+    assert list(loaded) == ["ARND", "WY"]
@@ -1,6 +1,11 @@
+from seq2feature.batch import SequenceBatch
 from seq2feature.features.composition import (
+    AMINO_ACID_COLUMNS,
+    DIPEPTIDE_COLUMNS,
     get_amino_acid_composition,
+    get_amino_acid_composition_matrix,
     get_dipeptide_composition,
+    get_dipeptide_composition_matrix,
 )
 
 
@@ -35,3 +40,22 @@ def test_get_dipeptide_composition():
     assert abs(composition["AA"] - 1 / 3) < 1e-9
     assert abs(composition["AR"] - 1 / 3) < 1e-9
     assert abs(composition["RA"] - 1 / 3) < 1e-9
+
+
+def test_composition_matrices():
+    """Tests the fixed-schema composition matrices against the dict versions."""
+    assert len(AMINO_ACID_COLUMNS) == 25
+    assert len(DIPEPTIDE_COLUMNS) == 400
+
+    sequence = "AARNDX"
+    batch = SequenceBatch.from_sequences(["s"], [sequence])
+    row = dict(zip(AMINO_ACID_COLUMNS, get_amino_acid_composition_matrix(batch)[0]))
+    for aa, freq in get_amino_acid_composition(sequence).items():
+        assert abs(row[aa] - freq) < 1e-9
+    assert row["W"] == 0
+
+    row = dict(zip(DIPEPTIDE_COLUMNS, get_dipeptide_composition_matrix(batch)[0]))
+    for dp, freq in get_dipeptide_composition(sequence).items():
+        if "X" not in dp:
+            assert abs(row[dp] - freq) < 1e-9
+    assert row["WW"] == 0
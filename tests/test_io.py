@@ -1,5 +1,14 @@
+import gzip
 import os
-from seq2feature.io import read_fasta
+import pytest
+from Bio import bgzf
+from seq2feature.io import (
+    build_fasta_index,
+    detect_compression,
+    load_fasta_index,
+    read_fasta,
+    read_fasta_file,
+)
 
 
 def test_read_fasta():
@@ -24,3 +33,79 @@ def test_read_fasta_invalid_format():
     invalid_content = "This is not a FASTA file"
     records = read_fasta(invalid_content)
     assert len(records) == 0
+
+
+FASTA_CONTENT = ">seq1 first\nACGTACGT\nACG\n>seq2\nGGGG\n>seq3 third\nTTTTAAAA\nCC\n"
+
+
+def _write_bgzip(path, data):
+    with bgzf.BgzfWriter(path, "wb") as handle:
+        handle.write(data.encode())
+
+
+def test_read_fasta_file_compressed(tmp_path):
+    """Tests read_fasta_file with plain, gzip, and bgzip input."""
+    plain = tmp_path / "seqs.fasta"
+    plain.write_text(FASTA_CONTENT)
+    gz = tmp_path / "seqs.fasta.gz"
+    with gzip.open(gz, "wt") as handle:
+        handle.write(FASTA_CONTENT)
+    bgz = tmp_path / "seqs.fasta.bgz"
+    _write_bgzip(str(bgz), FASTA_CONTENT)
+
+    assert detect_compression(plain) is None
+    assert detect_compression(gz) == "gzip"
+    assert detect_compression(bgz) == "bgzip"
+    for path in (plain, gz, bgz):
+        records = read_fasta_file(path)
+        assert [r.id for r in records] == ["seq1", "seq2", "seq3"]
+        assert str(records[0].seq) == "ACGTACGTACG"
+
+
+def test_read_fasta_file_zstd(tmp_path):
+    """Tests read_fasta_file with zstd input when zstandard is installed."""
+    zstandard = pytest.importorskip("zstandard")
+
+    path = tmp_path / "seqs.fasta.zst"
+    path.write_bytes(zstandard.ZstdCompressor().compress(FASTA_CONTENT.encode()))
+    assert detect_compression(path) == "zstd"
+    records = read_fasta_file(path, ids=["seq2"])
+    assert [(r.id, str(r.seq)) for r in records] == [("seq2", "GGGG")]
+
+
+def test_fasta_index_random_access(tmp_path):
+    """Tests building an offset index and fetching records by ID."""
+    plain = tmp_path / "seqs.fasta"
+    plain.write_text(FASTA_CONTENT)
+    bgz = tmp_path / "seqs.fasta.bgz"
+    _write_bgzip(str(bgz), FASTA_CONTENT)
+
+    for path in (plain, bgz):
+        index = build_fasta_index(path)
+        assert index["seq1"][0] == 11
+        assert index["seq3"][2:] == (8, 9)
+        assert load_fasta_index(f"{path}.fai") == index
+
+        records = read_fasta_file(path, ids=["seq3", "seq1", "missing"])
+        assert [r.id for r in records] == ["seq1", "seq3"]
+        assert [r.description for r in records] == ["seq1 first", "seq3 third"]
+        assert str(records[1].seq) == "TTTTAAAACC"
+
+
+def test_fasta_index_out_of_date(tmp_path):
+    """Tests that an index built for a different file version is rejected."""
+    path = tmp_path / "seqs.fasta"
+    path.write_text(FASTA_CONTENT)
+    build_fasta_index(path)
+    path.write_text(">x\nAAAAAAAAAAAAAAAAAA\n>seq1 first\nGGGG\n")
+    with pytest.raises(ValueError):
+        read_fasta_file(path, ids=["seq1"])
+
+
+def test_build_fasta_index_rejects_gzip(tmp_path):
+    """Tests that plain gzip files cannot be indexed for random access."""
+    gz = tmp_path / "seqs.fasta.gz"
+    with gzip.open(gz, "wt") as handle:
+        handle.write(FASTA_CONTENT)
+    with pytest.raises(ValueError):
+        build_fasta_index(gz)
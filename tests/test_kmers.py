@@ -1,4 +1,10 @@
-from seq2feature.features.kmers import get_kmer_frequencies
+from seq2feature.batch import SequenceBatch
+from seq2feature.features.kmers import (
+    KMER_ALPHABETS,
+    get_kmer_frequencies,
+    get_kmer_frequency_matrix,
+    kmer_columns,
+)
 
 
 def test_get_kmer_frequencies():
@@ -21,3 +27,42 @@ def test_get_kmer_frequencies():
     assert abs(k3_freq["AGT"] - 2 / 4) < 1e-9
     assert abs(k3_freq["GTA"] - 1 / 4) < 1e-9
     assert abs(k3_freq["TAG"] - 1 / 4) < 1e-9
+
+
+def _frequency_row(sequence, k, seq_type="DNA"):
+    """Returns the fixed-schema k-mer frequencies of one sequence as a dict."""
+    batch = SequenceBatch.from_sequences(["s"], [sequence])
+    row = get_kmer_frequency_matrix(batch, k, seq_type)[0]
+    return dict(zip(kmer_columns(KMER_ALPHABETS[seq_type], k), row))
+
+
+def test_get_kmer_frequency_matrix_schema():
+    """Tests k-mer frequencies over the fixed DNA schema."""
+    assert len(kmer_columns("ACGT", 2)) == 16
+    frequencies = _frequency_row("AGTAGT", 2)
+    assert abs(frequencies["AG"] - 2 / 5) < 1e-9
+    assert abs(frequencies["TA"] - 1 / 5) < 1e-9
+    assert frequencies["CC"] == 0
+
+    # K-mers with residues outside the alphabet are not counted
+    frequencies = _frequency_row("ANGT", 2)
+    assert abs(frequencies["GT"] - 1 / 3) < 1e-9
+    assert abs(sum(frequencies.values()) - 1 / 3) < 1e-9
+
+
+def test_get_kmer_frequency_matrix():
+    """Tests batch k-mer frequencies against the dict-based frequencies."""
+    sequences = ["AGTAGT", "A", "", "CCGG", "TTTT"]
+    batch = SequenceBatch.from_sequences(list("abcde"), sequences)
+    matrix = get_kmer_frequency_matrix(batch, 2, "DNA")
+    assert matrix.shape == (5, 16)
+    for row, sequence in zip(matrix, sequences):
+        row = dict(zip(kmer_columns("ACGT", 2), row))
+        expected = get_kmer_frequencies(sequence, 2)
+        assert all(abs(row[kmer] - freq) < 1e-9 for kmer, freq in expected.items())
+        assert abs(sum(row.values()) - sum(expected.values())) < 1e-9
+
+
+def test_get_kmer_frequency_matrix_lowercase():
+    """Tests that lowercase and soft-masked residues are counted."""
+    assert _frequency_row("acgtACGTaa", 2) == _frequency_row("ACGTACGTAA", 2)
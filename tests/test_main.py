@@ -1,4 +1,9 @@
+import numpy as np
 import pandas as pd
+from pathlib import Path
+from seq2feature import main
+from seq2feature.batch import SequenceBatch
+from seq2feature.io import build_fasta_index
 from seq2feature.main import extract_features
 
 
@@ -10,16 +15,109 @@ def test_extract_features():
     df_aac = extract_features(fasta_content, feature_types=["amino_acid_composition"])
     assert isinstance(df_aac, pd.DataFrame)
     assert len(df_aac) == 2
-    assert "A" in df_aac.columns
+    assert "aac_A" in df_aac.columns
     # Protein1: A=1, R=1, N=1, D=1 -> A_comp = 1/4 = 0.25
-    assert df_aac[df_aac["id"] == "protein1"]["A"].iloc[0] == 0.25
+    assert df_aac[df_aac["id"] == "protein1"]["aac_A"].iloc[0] == 0.25
 
     # Test k-mer frequencies
     df_kmer = extract_features(fasta_content, feature_types=["kmer_frequencies"], k=2)
-    assert "AG" in df_kmer.columns
+    assert "kmer_AG" in df_kmer.columns
     # dna1: AG, GC, CT -> AG_freq = 1/3
-    assert df_kmer[df_kmer["id"] == "dna1"]["AG"].iloc[0] == 1 / 3
+    assert df_kmer[df_kmer["id"] == "dna1"]["kmer_AG"].iloc[0] == 1 / 3
 
     # Test physicochemical features
     df_physchem = extract_features(fasta_content, feature_types=["physicochemical"])
     assert "molecular_weight" in df_physchem.columns
+
+
+def test_extract_features_by_ids(tmp_path):
+    """Tests extracting features for a subset of records from an indexed file."""
+    path = tmp_path / "seqs.fasta"
+    path.write_text(">protein1\nARND\n>dna1\nAGCT\n>dna2\nAAAA\n")
+    build_fasta_index(path)
+
+    df = extract_features(Path(path), feature_types=["kmer_frequencies"], k=1, ids=["dna2"])
+    assert list(df["id"]) == ["dna2"]
+    assert df["kmer_A"].iloc[0] == 1.0
+
+
+def test_extract_features_fixed_schema():
+    """Tests that the fixed schema fills absent features with 0 and matches the row path."""
+    fasta_content = ">protein1\nARND\n>protein2\nWWYY\n>dna1\nAGCT\n"
+
+    df = extract_features(fasta_content, feature_types=["amino_acid_composition", "dipeptide_composition"])
+    assert len(df.columns) == 3 + 25 + 400
+    assert df[df["id"] == "protein2"]["aac_A"].iloc[0] == 0
+    assert df[df["id"] == "protein2"]["dpc_WW"].iloc[0] == 1 / 3
+    # Protein features do not apply to DNA records
+    assert df[df["id"] == "dna1"][["aac_A", "dpc_WW"]].isna().all(axis=None)
+
+    df = extract_features(fasta_content, feature_types=["kmer_frequencies"], k=2, dtype="float32")
+    assert df["kmer_AG"].dtype == "float32"
+    df_rows = extract_features(fasta_content, feature_types=["kmer_frequencies"], k=2, fixed_schema=False)
+    for col in df_rows.columns[3:]:
+        assert ((df_rows[col] - df[col]).abs().fillna(0) < 1e-6).all()
+
+
+def test_extract_features_from_batch():
+    """Tests extracting features directly from a packed sequence batch."""
+    batch = SequenceBatch.from_sequences(["protein1", "dna1"], ["ARND", "AGCT"])
+    df = extract_features(
+        batch, feature_types=["amino_acid_composition", "physicochemical"], include_sequence=False
+    )
+    assert "sequence" not in df.columns
+    assert list(df["type"]) == ["Protein", "DNA"]
+    assert df[df["id"] == "protein1"]["aac_A"].iloc[0] == 0.25
+    assert df[df["id"] == "protein1"]["molecular_weight"].notna().all()
+
+    df = extract_features(batch, feature_types=["kmer_frequencies"], k=2, ids=["dna1"])
+    assert list(df["id"]) == ["dna1"]
+    assert df["kmer_AG"].iloc[0] == 1 / 3
+
+
+def test_extract_features_dedup():
+    """Tests dropping near-duplicate sequences before extraction."""
+    fasta_content = ">a\nARNDCEQGHILKMFPSTWYV\n>b\nARNDCEQGHILKMFPSTWYV\n>c\nWWWWYYYYFFFFPPPP\n"
+    df = extract_features(fasta_content, feature_types=["amino_acid_composition"], dedup=True)
+    assert list(df["id"]) == ["a", "c"]
+
+
+def test_extract_features_lowercase():
+    """Tests that lowercase input is typed and counted like uppercase input."""
+    df = extract_features(">d\nacgtacgtaa\n", feature_types=["kmer_frequencies"], k=2)
+    assert df["type"].iloc[0] == "DNA"
+    assert abs(df["kmer_AC"].iloc[0] - 2 / 9) < 1e-9
+
+
+def test_extract_features_families_do_not_collide():
+    """Tests that feature families with overlapping keys keep separate columns."""
+    fasta_content = ">protein1\nAARND\n"
+    feature_types = ["amino_acid_composition", "dipeptide_composition", "kmer_frequencies"]
+    for fixed_schema in (True, False):
+        df = extract_features(fasta_content, feature_types, k=1, fixed_schema=fixed_schema)
+        assert df["aac_A"].iloc[0] == 0.4
+        assert df["kmer_A"].iloc[0] == 0.4
+        assert df["dpc_AA"].iloc[0] == 0.25
+
+
+def test_extract_features_chunked_fill(monkeypatch):
+    """Tests that filling in small chunks, in place or buffered, gives the same matrix."""
+    sequences = ["ARNDW", "ACGTAC", "WWYY", "GGCCA", "ARNDARND", "TTTT", "MKV"]
+    batch = SequenceBatch.from_sequences([f"s{i}" for i in range(len(sequences))], sequences)
+    feature_types = ["amino_acid_composition", "kmer_frequencies"]
+    expected = extract_features(batch, feature_types, k=2)
+
+    monkeypatch.setattr(main, "FILL_CHUNK_CELLS", 20)
+    monkeypatch.setattr(main, "FILL_CHUNK_RESIDUES", 6)
+    chunked = extract_features.__wrapped__(batch, feature_types, k=2, dtype="float32")
+    assert (chunked.dtypes.iloc[3:] == "float32").all()
+    assert np.allclose(
+        chunked.iloc[:, 3:].to_numpy(), expected.iloc[:, 3:].to_numpy(), equal_nan=True
+    )
+
+
+def test_extract_features_wide_kmer_schema():
+    """Tests that k-mer schemas above the column limit keep only the observed k-mers."""
+    df = extract_features(">dna1\nACGTACGTACGT\n", feature_types=["kmer_frequencies"], k=10)
+    assert list(df.columns[3:]) == ["kmer_ACGTACGTAC", "kmer_CGTACGTACG", "kmer_GTACGTACGT"]
+    assert df["kmer_ACGTACGTAC"].iloc[0] == 1 / 3
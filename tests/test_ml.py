@@ -0,0 +1,57 @@
+import random
+import numpy as np
+import pandas as pd
+from seq2feature.ml import group_train_test_split, train_model
+
+
+def test_train_model_homology_aware_split():
+    """Tests that the homology-aware split keeps near-duplicates on one side."""
+    rng = random.Random(0)
+    sequences = []
+    for _ in range(15):
+        sequence = "".join(rng.choices("ACDEFGHIKLMNPQRSTVWY", k=100))
+        sequences += [sequence, sequence[:-1] + "A"]
+    ids = [f"s{i}" for i in range(len(sequences))]
+    df = pd.DataFrame({"id": ids, "sequence": sequences, "length": [len(s) for s in sequences]})
+    labels_df = pd.DataFrame({"id": ids, "label": [i % 2 for i in range(len(ids))]})
+
+    model, X_train, X_test, *_ = train_model(
+        df, labels_df, ["length"], "RandomForest", "Fill with 0", "Homology-aware"
+    )
+    assert model is not None
+    train_pairs = {i // 2 for i in X_train.index}
+    test_pairs = {i // 2 for i in X_test.index}
+    assert not train_pairs & test_pairs
+
+
+def test_group_train_test_split():
+    """Tests that groups stay whole and the test set holds about 20% of the rows."""
+    groups = np.repeat(np.arange(50), 2)
+    train_idx, test_idx = group_train_test_split(groups)
+    assert len(test_idx) == 20
+    assert not set(groups[train_idx]) & set(groups[test_idx])
+
+    # One group of 90 rows and ten singletons: the large group stays in training
+    groups = np.concatenate([np.zeros(90, dtype=int), np.arange(1, 11)])
+    for seed in range(10):
+        train_idx, test_idx = group_train_test_split(groups, random_state=seed)
+        assert len(test_idx) == 10
+        assert len(train_idx) + len(test_idx) == len(groups)
+        assert not set(groups[train_idx]) & set(groups[test_idx])
+
+    # Groups larger than the target: the smallest one is the test set
+    groups = np.repeat([0, 1, 2], [50, 30, 40])
+    train_idx, test_idx = group_train_test_split(groups)
+    assert set(groups[test_idx]) == {1}
+
+
+def test_train_model_single_cluster():
+    """Tests that a homology-aware split of one cluster warns instead of raising."""
+    base = "ARNDCEQGHILKMFPSTWYV" * 5
+    sequences = [base[:i] + "W" + base[i + 1 :] for i in range(12)]
+    ids = [f"s{i}" for i in range(len(sequences))]
+    df = pd.DataFrame({"id": ids, "sequence": sequences, "length": [len(s) for s in sequences]})
+    labels_df = pd.DataFrame({"id": ids, "label": [i % 2 for i in range(len(ids))]})
+
+    result = train_model(df, labels_df, ["length"], "RandomForest", "Fill with 0", "Homology-aware")
+    assert result == (None,) * 7
@@ -0,0 +1,98 @@
+import random
+import numpy as np
+from seq2feature import similarity
+from seq2feature.batch import SequenceBatch
+from seq2feature.similarity import (
+    EMPTY_HASH,
+    MAX_BUCKET_LEADERS,
+    cluster_sequences,
+    deduplicate,
+    minhash_signatures,
+    near_duplicate_clusters,
+)
+
+
+def _mutate(sequence, n, rng):
+    residues = list(sequence)
+    for _ in range(n):
+        residues[rng.randrange(len(residues))] = rng.choice("ACDEFGHIKLMNPQRSTVWY")
+    return "".join(residues)
+
+
+def test_minhash_signatures():
+    """Tests that signatures match for identical k-mer sets and differ otherwise."""
+    batch = SequenceBatch.from_sequences(
+        ["a", "b", "c", "d"], ["ARNDCEQGHILK", "arndceqghilk", "WWYYFFPPSSTT", "AR"]
+    )
+    signatures = minhash_signatures(batch, k=3, num_perm=64)
+    assert signatures.shape == (4, 64)
+    assert (signatures[0] == signatures[1]).all()
+    assert (signatures[0] != signatures[2]).mean() > 0.9
+    assert (signatures[3] == EMPTY_HASH).all()
+
+
+def test_cluster_sequences():
+    """Tests that mutated copies cluster with their originals and nothing else."""
+    rng = random.Random(0)
+    originals = ["".join(rng.choices("ACDEFGHIKLMNPQRSTVWY", k=200)) for _ in range(50)]
+    copies = [_mutate(seq, 4, rng) for seq in originals[:10]]
+    sequences = originals + copies + ["AR", "AR"]
+    batch = SequenceBatch.from_sequences([str(i) for i in range(len(sequences))], sequences)
+
+    labels = cluster_sequences(batch)
+    assert (labels[:10] == labels[50:60]).all()
+    assert len(np.unique(labels[:50])) == 50
+    # Sequences shorter than k are never grouped
+    assert labels[60] != labels[61]
+
+    deduplicated = deduplicate(batch)
+    assert list(deduplicated.ids) == [str(i) for i in range(50)] + ["60", "61"]
+
+
+def test_cluster_sequences_unrelated_dna():
+    """Tests that long unrelated DNA sequences are not merged into one cluster."""
+    rng = random.Random(0)
+    sequences = ["".join(rng.choices("ACGT", k=3000)) for _ in range(20)]
+    copy = sequences[0][:1500] + "A" + sequences[0][1501:]
+    batch = SequenceBatch.from_sequences([str(i) for i in range(21)], sequences + [copy])
+
+    labels = cluster_sequences(batch)
+    assert len(np.unique(labels[:20])) == 20
+    assert labels[20] == labels[0]
+
+
+def test_near_duplicate_clusters_checks_whole_bucket():
+    """Tests that bucket members are linked even when they fail against the first member."""
+    signatures = np.array(
+        [
+            [1, 1, 1, 1, 9, 9, 9, 9],
+            [1, 1, 1, 1, 2, 3, 4, 5],
+            [1, 1, 1, 1, 2, 3, 4, 6],
+        ],
+        dtype=np.uint64,
+    )
+    labels = near_duplicate_clusters(signatures, bands=2, threshold=0.6)
+    assert labels[1] == labels[2]
+    assert labels[0] != labels[1]
+
+
+def test_near_duplicate_clusters_large_family(monkeypatch):
+    """Tests that a large homologous family is linked with a linear number of comparisons."""
+    rng = random.Random(0)
+    ancestor = "".join(rng.choices("ACDEFGHIKLMNPQRSTVWY", k=200))
+    # Members are close to the ancestor but often below the threshold to each other.
+    sequences = [_mutate(ancestor, 8, rng) for _ in range(3000)]
+    batch = SequenceBatch.from_sequences([str(i) for i in range(len(sequences))], sequences)
+    signatures = minhash_signatures(batch)
+
+    compared = []
+    similar = similarity._similar
+
+    def counting_similar(signatures, sources, targets, threshold):
+        compared.append(len(sources))
+        return similar(signatures, sources, targets, threshold)
+
+    monkeypatch.setattr(similarity, "_similar", counting_similar)
+    labels = near_duplicate_clusters(signatures, bands=32)
+    assert sum(compared) <= 32 * MAX_BUCKET_LEADERS * len(batch)
+    assert np.bincount(labels).max() >= 0.99 * len(batch)
@@ -1,4 +1,5 @@
-from seq2feature.utils import detect_sequence_type
+from seq2feature.batch import SequenceBatch
+from seq2feature.utils import detect_sequence_type, detect_sequence_types
 
 
 def test_detect_sequence_type():
@@ -9,3 +10,10 @@ def test_detect_sequence_type():
     assert detect_sequence_type("ACGTU") == "Unknown"
     assert detect_sequence_type("J") == "Protein"
     assert detect_sequence_type("") == "Unknown"
+
+
+def test_detect_sequence_types():
+    """Tests batch type detection against detect_sequence_type."""
+    sequences = ["ACGTN", "acgun", "ACDEFGHIKLMNPQRSTVWYBJZXO", "ACGTU", "J", "", "AC-GT"]
+    batch = SequenceBatch.from_sequences([str(i) for i in range(len(sequences))], sequences)
+    assert detect_sequence_types(batch) == [detect_sequence_type(s) for s in sequences]